@@ -29,11 +29,14 @@ async def async_service_request_sync(coordinator: GoogleKeepSyncCoordinator, cal
         _LOGGER.info("Requesting manual sync.")
         await coordinator.async_refresh()
     else:
-        time_to_next_allowed_update = round(sync_threshold - seconds_since_update)
-        _LOGGER.warning(
-            "Requesting sync too soon after last update."
-            f" Try again in {time_to_next_allowed_update} seconds."
-        )
+        # Defer the sync until the cooldown has passed, collapsing repeated
+        # requests into a single refresh
+        delay = sync_threshold - seconds_since_update
+        if coordinator.async_schedule_refresh(delay):
+            _LOGGER.info(
+                "Requesting sync too soon after last update."
+                f" Sync will run in {round(delay)} seconds."
+            )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -53,8 +56,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await coordinator.async_config_entry_first_refresh()
 
     # Store the coordinator object in hass.data
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[entry.entry_id] = coordinator
 
     # Register the request_sync service
     hass.services.async_register(
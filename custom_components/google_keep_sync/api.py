@@ -1,8 +1,14 @@
 """API for synchronization with Google Keep."""
 
+import asyncio
 import functools
 import logging
+import random
+import time
+from collections.abc import Callable
 from enum import StrEnum
+from http import HTTPStatus
+from itertools import pairwise
 
 import gkeepapi
 from homeassistant.core import HomeAssistant
@@ -11,6 +17,20 @@ from homeassistant.helpers import storage
 STORAGE_KEY = "google_keep_sync"
 STORAGE_VERSION = 1
 
+# Minimum number of seconds between two syncs with Google Keep
+SYNC_MIN_INTERVAL = 0.5
+# Number of times a rate limited sync is retried, and the maximum backoff
+SYNC_MAX_RETRIES = 5
+SYNC_MAX_BACKOFF = 60
+# Random variation applied to the exponential backoff, as a fraction of it
+SYNC_BACKOFF_JITTER = 0.5
+# Number of seconds after a sync during which fetch_all_lists doesn't sync again
+LISTS_CACHE_TTL = 30
+# Number of successful syncs between two saves of the Keep state
+STATE_SAVE_INTERVAL = 10
+# Number of seconds a state save is delayed so that saves can be batched
+STATE_SAVE_DELAY = 15
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -24,6 +44,15 @@ class ListCase(StrEnum):
     TITLE = "title"
 
 
+# Functions used to change the case of an item for each ListCase
+CASE_FUNCTIONS: dict[ListCase, Callable[[str], str]] = {
+    ListCase.UPPER: str.upper,
+    ListCase.LOWER: str.lower,
+    ListCase.SENTENCE: str.capitalize,
+    ListCase.TITLE: str.title,
+}
+
+
 class GoogleKeepAPI:
     """Class to authenticate and interact with Google Keep."""
 
@@ -39,10 +68,24 @@ class GoogleKeepAPI:
         self._hass = hass
         self._username = username
         self._password = password
+        # Write atomically so a crash mid-write can't corrupt the saved token
         self._store = storage.Store(
-            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{username}.json"
+            hass,
+            STORAGE_VERSION,
+            f"{STORAGE_KEY}.{username}.json",
+            atomic_writes=True,
         )
         self._authenticated = False
+        self._next_sync_time = 0.0
+        self._last_sync_time: float | None = None
+        self._sync_lock = asyncio.Lock()
+        self._push_tasks: set[asyncio.Task] = set()
+        self._last_saved_token: str | None = None
+        self._last_saved_keep_version: str | None = None
+        self._syncs_since_save = 0
+        self._item_index: dict[str, dict[str, gkeepapi.node.ListItem]] = {}
+        self._all_lists: list[gkeepapi.node.List] | None = None
+        self._all_lists_keep_version: str | None = None
         self._token = token if token else None
 
     async def async_login_with_saved_state(self) -> bool:
@@ -67,6 +110,10 @@ class GoogleKeepAPI:
                 return False
             except gkeepapi.exception.ResyncRequiredException as e:
                 _LOGGER.warning("Full resync required: %s", e)
+                # Only the state is stale, so resume with the saved token next
+                # instead of falling back to a password login
+                if not self._token:
+                    self._token = saved_token
                 return False
         else:
             return False
@@ -82,7 +129,7 @@ class GoogleKeepAPI:
                     self._keep.resume, self._username, self._token, None
                 )
                 self._token = self._keep.getMasterToken()  # Store the new token
-                await self._async_save_state_and_token()
+                await self._async_save_state_and_token(force=True)
 
             except gkeepapi.exception.LoginException as e:
                 _LOGGER.error("Failed to resume Google Keep with token: %s", e)
@@ -100,7 +147,7 @@ class GoogleKeepAPI:
                 self._keep.login, self._username, self._password
             )
             self._token = self._keep.getMasterToken()  # Store the new token
-            await self._async_save_state_and_token()
+            await self._async_save_state_and_token(force=True)
         except gkeepapi.exception.LoginException as e:
             _LOGGER.error(
                 "Failed to login to Google Keep with username and password: %s", e
@@ -112,11 +159,16 @@ class GoogleKeepAPI:
 
     async def authenticate(self) -> bool:
         """Log in to Google Keep."""
+        if self._authenticated:
+            return True
+
         if not await self.async_login_with_saved_state():
             if not await self.async_login_with_saved_token():
                 if not await self.async_login_with_password():
                     return False
 
+        # Logging in or resuming with gkeepapi also syncs with Google Keep
+        self._last_sync_time = time.monotonic()
         return True
 
     @property
@@ -131,15 +183,19 @@ class GoogleKeepAPI:
 
     @staticmethod
     def authenticated_required(func):
-        """Ensure the user is authenticated before calling the function."""
+        """Ensure the user is authenticated before calling the function.
+
+        The wrapper returns the coroutine of the wrapped function directly,
+        so no extra coroutine is created for each call.
+        """
 
         @functools.wraps(func)
-        async def wrapper(api_instance, *args, **kwargs):
+        def wrapper(api_instance, *args, **kwargs):
             if not api_instance._authenticated:
                 raise Exception(
                     "Not authenticated with Google Keep. Please authenticate first."
                 )
-            return await func(api_instance, *args, **kwargs)
+            return func(api_instance, *args, **kwargs)
 
         return wrapper
 
@@ -147,21 +203,70 @@ class GoogleKeepAPI:
     async def async_create_todo_item(self, list_id: str, text: str) -> None:
         """Create a new item in a specified list in Google Keep."""
         keep_list = self._keep.get(list_id)
-        if keep_list and isinstance(keep_list, gkeepapi.node.List):
-            await self._hass.async_add_executor_job(keep_list.add, text, False)
-        else:
+        if not keep_list or not isinstance(keep_list, gkeepapi.node.List):
             raise Exception(f"List with ID {list_id} not found in Google Keep.")
 
-    async def _async_save_state_and_token(self) -> None:
-        """Save the current state, token, and username of Google Keep."""
-        state = await self._hass.async_add_executor_job(self._keep.dump)
+        # Adding an item only changes the in-memory list, so no executor job is
+        # needed. The item is sent to Google Keep on the next sync, and the
+        # lock keeps a sync in the executor from reading the list meanwhile
+        async with self._sync_lock:
+            item = keep_list.add(text, False)
 
+            # Index the new item so it can be updated or deleted without a scan
+            if list_id in self._item_index:
+                self._item_index[list_id][item.id] = item
+
+    async def _async_save_state_and_token(self, force: bool = False) -> None:
+        """Save the current state, token, and username of Google Keep.
+
+        Unless forced, nothing is saved if the token and the Keep version are
+        unchanged since the last save, and the write is delayed. Forced saves
+        are written immediately.
+        """
         if not self._token:
             self._token = self._keep.getMasterToken()
 
-        await self._store.async_save(
-            {"token": self._token, "state": state, "username": self._username}
-        )
+        keep_version = getattr(self._keep, "_keep_version", None)
+        if (
+            not force
+            and keep_version is not None
+            and self._token == self._last_saved_token
+            and keep_version == self._last_saved_keep_version
+        ):
+            _LOGGER.debug("State and token unchanged, skipping save")
+            return
+
+        # Keep is not thread-safe, so don't dump it while a sync is running
+        async with self._sync_lock:
+            state = await self._hass.async_add_executor_job(self._keep.dump)
+        data = {"token": self._token, "state": state, "username": self._username}
+
+        if force:
+            # Write a newly issued token right away, so it isn't lost if Home
+            # Assistant stops before a delayed save is written
+            await self._store.async_save(data)
+        else:
+            # The store writes the latest data once the delay has passed, or
+            # when Home Assistant stops, so consecutive saves are batched
+            self._store.async_delay_save(lambda: data, STATE_SAVE_DELAY)
+        self._last_saved_token = self._token
+        self._last_saved_keep_version = keep_version
+
+    async def async_save_state(self) -> None:
+        """Save the state of Google Keep if it changed since the last save."""
+        self._syncs_since_save = 0
+        if self._authenticated:
+            await self._async_save_state_and_token()
+
+    async def _async_save_state_periodically(self) -> None:
+        """Save the state every STATE_SAVE_INTERVAL successful syncs.
+
+        This way a restart resumes from a recent state instead of the one
+        saved at login.
+        """
+        self._syncs_since_save += 1
+        if self._syncs_since_save >= STATE_SAVE_INTERVAL:
+            await self.async_save_state()
 
     async def _async_clear_token(self) -> None:
         """Clear the saved token."""
@@ -184,20 +289,21 @@ class GoogleKeepAPI:
     async def async_delete_todo_item(self, list_id: str, item_id: str) -> None:
         """Delete a specific item from a Google Keep list."""
         keep_list = self._keep.get(list_id)
-        if keep_list and isinstance(keep_list, gkeepapi.node.List):
-            item_to_delete = next(
-                (item for item in keep_list.items if item.id == item_id), None
-            )
-            if item_to_delete:
-                # Delete the item using the delete method on the ListItem object
-                await self._hass.async_add_executor_job(item_to_delete.delete)
-                _LOGGER.debug(
-                    "Item %s deleted from list %s in Google Keep", item_id, list_id
-                )
-            else:
-                _LOGGER.warning("Item %s not found in list %s", item_id, list_id)
-        else:
+        if not keep_list or not isinstance(keep_list, gkeepapi.node.List):
             _LOGGER.error("List %s not found in Google Keep", list_id)
+            return
+
+        async with self._sync_lock:
+            item_to_delete = self._get_list_item(list_id, keep_list, item_id)
+            if not item_to_delete:
+                _LOGGER.warning("Item %s not found in list %s", item_id, list_id)
+                return
+
+            # Delete the item using the delete method on the ListItem object.
+            # This only marks the node as deleted, so it can run inline
+            item_to_delete.delete()
+            self._item_index.get(list_id, {}).pop(item_id, None)
+        _LOGGER.debug("Item %s deleted from list %s in Google Keep", item_id, list_id)
 
     @authenticated_required
     async def async_update_todo_item(
@@ -209,25 +315,62 @@ class GoogleKeepAPI:
     ) -> None:
         """Update an existing item within a list in Google Keep."""
         keep_list = self._keep.get(list_id)
-        if keep_list and isinstance(keep_list, gkeepapi.node.List):
-            for item in keep_list.items:
-                if item.id == item_id:
-                    if new_text is not None:
-                        item.text = new_text
-                    if checked is not None:
-                        item.checked = checked
-                    break
+        if not keep_list or not isinstance(keep_list, gkeepapi.node.List):
+            return
+
+        async with self._sync_lock:
+            item = self._get_list_item(list_id, keep_list, item_id)
+            if item:
+                if new_text is not None:
+                    item.text = new_text
+                if checked is not None:
+                    item.checked = checked
+
+    def _get_list_item(
+        self, list_id: str, keep_list: gkeepapi.node.List, item_id: str
+    ) -> gkeepapi.node.ListItem | None:
+        """Get an item of a list by id, indexing the list on its first lookup.
+
+        List.items filters and sorts the items on every access, so each list is
+        indexed once per sync instead of being scanned for every lookup.
+        """
+        index = self._item_index.get(list_id)
+        if index is None:
+            index = {item.id: item for item in keep_list.items}
+            self._item_index[list_id] = index
+
+        item = index.get(item_id)
+        if item is None or item.deleted:
+            # Fall back to a scan for items changed since the list was indexed
+            item = next((item for item in keep_list.items if item.id == item_id), None)
+        return item
 
     @authenticated_required
     async def fetch_all_lists(self) -> list[gkeepapi.node.List]:
         """Fetch all lists from Google Keep."""
-        # Ensure the API is synced
-        await self._hass.async_add_executor_job(self._keep.sync)
-
-        # Retrieve all lists
-        return [
-            note for note in self._keep.all() if isinstance(note, gkeepapi.node.List)
-        ]
+        # Ensure the API is synced, unless it was synced moments ago
+        if (
+            self._last_sync_time is None
+            or time.monotonic() - self._last_sync_time >= LISTS_CACHE_TTL
+        ):
+            await self._async_sync()
+
+        # Reuse the lists found previously if the sync brought no changes
+        keep_version = getattr(self._keep, "_keep_version", None)
+        if (
+            self._all_lists is None
+            or keep_version is None
+            or keep_version != self._all_lists_keep_version
+        ):
+            self._all_lists = [
+                note
+                for note in self._keep.all()
+                if isinstance(note, gkeepapi.node.List)
+            ]
+            self._all_lists_keep_version = keep_version
+
+        # Return a copy so callers can't modify the cached lists
+        return list(self._all_lists)
 
     @authenticated_required
     async def async_sync_data(
@@ -237,48 +380,67 @@ class GoogleKeepAPI:
         change_case: ListCase = ListCase.NO_CHANGE,
     ) -> list[gkeepapi.node.List] | None:
         """Synchronize data only from configured lists with Google Keep."""
+        # Nothing to sync until the user has selected at least one list
+        if not lists_to_sync:
+            return []
+
         lists_changed: bool = False
+        do_case: bool = change_case != ListCase.NO_CHANGE
+        do_sort: bool = bool(sort_lists)
 
         try:
             # Run the synchronous Keep sync method in the executor
-            await self._hass.async_add_executor_job(self._keep.sync)
+            await self._async_sync()
 
             # Only get the lists that are configured to sync
             lists = []
-            for list_id in lists_to_sync:
-                keep_list: gkeepapi.node.List = await self._hass.async_add_executor_job(
-                    self._keep.get, list_id
-                )
-
-                # Change the case of the list items if necessary
-                if change_case != ListCase.NO_CHANGE:
-                    list_changed = await self._hass.async_add_executor_job(
-                        self.change_list_case, keep_list.items, change_case
-                    )
+            # Case and sort changes modify the synced nodes, so hold the lock to
+            # keep them from changing while a push runs in the executor
+            async with self._sync_lock:
+                for list_id in lists_to_sync:
+                    # Keep.get is an in-memory lookup, so no executor job is needed
+                    keep_list: gkeepapi.node.List | None = self._keep.get(list_id)
+
+                    # Skip lists that were deleted in Google Keep after being selected
+                    if keep_list is None:
+                        _LOGGER.warning("List %s not found in Google Keep", list_id)
+                        continue
+
+                    # Change the case of the list items if necessary
+                    if do_case:
+                        list_changed = self.change_list_case(
+                            keep_list.items, change_case
+                        )
 
-                    if list_changed:
-                        lists_changed = True
+                        if list_changed:
+                            lists_changed = True
 
-                # Sort the lists if the option is enabled
-                if sort_lists:
-                    unchecked: list[gkeepapi.node.ListItem] = keep_list.unchecked
+                    # Sort the lists if the option is enabled
+                    if do_sort:
+                        unchecked: list[gkeepapi.node.ListItem] = keep_list.unchecked
 
-                    # Don't sort the list if it's already sorted
-                    if not self.is_list_sorted(unchecked):
-                        # Sort the items, case-insensitive by default
-                        await self._hass.async_add_executor_job(
-                            keep_list.sort_items, lambda item: item.text.lower()
-                        )
-                        lists_changed = True
+                        # Don't sort the list if it's already sorted
+                        if not self.is_list_sorted(unchecked):
+                            # Sort the items, case-insensitive by default. Like the
+                            # case change, this is in-memory work on the synced
+                            # nodes, so it does not need an executor job
+                            keep_list.sort_items(lambda item: item.text.lower())
+                            lists_changed = True
 
-                lists.append(keep_list)
+                    lists.append(keep_list)
 
-            # If we made changes, we need to force an immediate resync
-            # to ensure that the user's changes are not overwritten on
-            # the next global sync interval
+            # If we made changes, push them right away to ensure that they are
+            # not overwritten on the next global sync interval. This runs in
+            # the background so the synced lists are returned without waiting
             if lists_changed:
-                await self._hass.async_add_executor_job(self._keep.sync)
-                _LOGGER.debug("Lists were modified, forcing immediate resync...")
+                _LOGGER.debug("Lists were modified, pushing changes...")
+                task = self._hass.async_create_background_task(
+                    self._async_push_changes(), f"{STORAGE_KEY}_push_changes"
+                )
+                self._push_tasks.add(task)
+                task.add_done_callback(self._push_tasks.discard)
+
+            await self._async_save_state_periodically()
 
             return lists
 
@@ -286,26 +448,143 @@ class GoogleKeepAPI:
             _LOGGER.error("Failed to sync with Google Keep: %s", e)
             return None
 
+    async def _async_push_changes(self) -> None:
+        """Push local changes to Google Keep.
+
+        If the push fails, the changed nodes stay dirty and are sent again
+        with the next sync.
+        """
+        try:
+            await self._async_sync()
+        except (
+            gkeepapi.exception.APIException,
+            gkeepapi.exception.SyncException,
+        ) as e:
+            _LOGGER.warning("Failed to push changes to Google Keep: %s", e)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any pending push of local changes to Google Keep.
+
+        Pushes only carry case and sort changes, which are applied again on the
+        next sync after the integration is loaded. A sync already running in
+        the executor can't be interrupted, so this waits for it to finish.
+        """
+        for task in self._push_tasks:
+            task.cancel()
+        await asyncio.gather(*self._push_tasks, return_exceptions=True)
+
+    async def _async_sync(self) -> None:
+        """Sync with Google Keep, backing off when the API is rate limited.
+
+        Only the sync itself holds the sync lock, so waiting between attempts
+        doesn't block other users of Keep.
+        """
+        for attempt in range(SYNC_MAX_RETRIES + 1):
+            # Space out consecutive syncs to avoid hitting the rate limit
+            delay = self._next_sync_time - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                await self._async_sync_once()
+            except gkeepapi.exception.APIException as e:
+                if (
+                    e.code != HTTPStatus.TOO_MANY_REQUESTS
+                    or attempt == SYNC_MAX_RETRIES
+                ):
+                    raise
+
+                retry_delay = self._get_retry_delay(e)
+                backoff = min(
+                    SYNC_MAX_BACKOFF,
+                    (
+                        retry_delay
+                        if retry_delay is not None
+                        else self._get_backoff(attempt)
+                    ),
+                )
+                if attempt == 0:
+                    _LOGGER.warning(
+                        "Google Keep rate limit reached, retrying sync in %s seconds",
+                        backoff,
+                    )
+                else:
+                    _LOGGER.debug("Retrying rate limited sync in %s seconds", backoff)
+                self._next_sync_time = time.monotonic() + backoff
+            else:
+                return
+
+    async def _async_sync_once(self) -> None:
+        """Sync with Google Keep once, one sync at a time as Keep is not thread-safe."""
+        async with self._sync_lock:
+            job = asyncio.ensure_future(
+                self._hass.async_add_executor_job(self._keep.sync)
+            )
+            try:
+                await asyncio.shield(job)
+            except asyncio.CancelledError:
+                # The sync in the executor can't be interrupted, so keep the
+                # lock until it has finished
+                await asyncio.wait([job])
+                raise
+            # The sync may have changed any list, so index the items again
+            self._item_index = {}
+            self._last_sync_time = time.monotonic()
+            self._next_sync_time = self._last_sync_time + SYNC_MIN_INTERVAL
+
+    @staticmethod
+    def _get_backoff(attempt: int) -> float:
+        """Return the exponential backoff for an attempt, with random jitter.
+
+        The jitter keeps several accounts that were rate limited at the same
+        time from retrying in lockstep.
+        """
+        jitter = random.uniform(  # noqa: S311
+            1 - SYNC_BACKOFF_JITTER, 1 + SYNC_BACKOFF_JITTER
+        )
+        return 2**attempt * jitter
+
+    @staticmethod
+    def _get_retry_delay(error: gkeepapi.exception.APIException) -> float | None:
+        """Return the retry delay in seconds requested by the server, if any."""
+        details = error.args[0] if error.args else None
+        if not isinstance(details, dict):
+            return None
+
+        for detail in details.get("details", []):
+            retry_delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+            if isinstance(retry_delay, str) and retry_delay.endswith("s"):
+                try:
+                    return float(retry_delay[:-1])
+                except ValueError:
+                    return None
+        return None
+
     @staticmethod
     def is_list_sorted(items: list[gkeepapi.node.ListItem]) -> bool:
         """Check if a list is sorted, case-insensitive by default."""
-        return all(
-            items[i].text.lower() <= items[i + 1].text.lower()
-            for i in range(len(items) - 1)
-        )
+        # Lowercase lazily so each item is lowercased at most once and the
+        # remaining items are skipped as soon as an unsorted pair is found
+        keys = (item.text.lower() for item in items)
+        return all(a <= b for a, b in pairwise(keys))
 
     @staticmethod
     def change_list_case(
         items: list[gkeepapi.node.ListItem], case_type: ListCase
     ) -> bool:
         """Change the case of all items in a list based on the specified case type."""
+        case_function = CASE_FUNCTIONS.get(case_type)
+        if case_function is None:
+            return False
+
         list_changed = False
 
         for item in items:
             original_text = item.text
-            new_text = GoogleKeepAPI.change_case(item.text, case_type)
+            new_text = case_function(original_text)
 
-            if original_text != new_text:
+            # Only assign changed text, since assigning marks the item dirty
+            if new_text is not original_text and new_text != original_text:
                 item.text = new_text
                 list_changed = True
 
@@ -314,12 +593,5 @@ class GoogleKeepAPI:
     @staticmethod
     def change_case(text: str, case_type: ListCase) -> str:
         """Change the case of the given text based on the specified case type."""
-        if case_type == ListCase.UPPER:
-            return text.upper()
-        elif case_type == ListCase.LOWER:
-            return text.lower()
-        elif case_type == ListCase.SENTENCE:
-            return text.capitalize()
-        elif case_type == ListCase.TITLE:
-            return text.title()
-        return text
+        case_function = CASE_FUNCTIONS.get(case_type)
+        return case_function(text) if case_function else text
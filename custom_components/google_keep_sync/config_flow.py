@@ -3,8 +3,10 @@
 import logging
 import re
 from collections.abc import Mapping
+from operator import itemgetter
 from typing import Any
 
+import gkeepapi
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant, callback
@@ -20,6 +22,13 @@ _LOGGER = logging.getLogger(__name__)
 
 INVALID_AUTH_URL = "https://github.com/watkins-matt/home-assistant-google-keep-sync?tab=readme-ov-file#invalid-authentication-errors"
 
+# Loose check that the username looks like an email address
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+
+# Master tokens all start with the same prefix and have the same length
+TOKEN_PREFIX = "aas_et/"  # noqa: S105
+TOKEN_LENGTH = 223
+
 SCHEMA_USER_DATA_STEP = vol.Schema(
     {
         vol.Required("username"): str,
@@ -43,6 +52,63 @@ CHOICES_LIST_CASE = {
     "title": "Title Case",
 }
 
+SELECTOR_LIST_CASE = selector.SelectSelector(
+    selector.SelectSelectorConfig(
+        options=[
+            selector.SelectOptionDict(value=key, label=value)
+            for key, value in CHOICES_LIST_CASE.items()
+        ],
+        mode=selector.SelectSelectorMode.DROPDOWN,
+    )
+)
+
+
+def _build_list_options(
+    lists: list[gkeepapi.node.List], existing_lists: list[str]
+) -> dict[str, str]:
+    """Map list ids to titles for the lists that can be selected, sorted by name."""
+    # Create a set of existing_lists for quick lookup
+    existing_list_set = frozenset(existing_lists)
+
+    # Select all lists that are not deleted, trashed or archived. Keep
+    # lists if we already had them selected previously
+    return dict(
+        sorted(
+            (
+                (lst.id, lst.title)
+                for lst in lists
+                if (not lst.deleted and not lst.trashed and not lst.archived)
+                or lst.id in existing_list_set
+            ),
+            key=itemgetter(1),
+        )
+    )
+
+
+def _build_options_schema(
+    list_options: dict[str, str], data: Mapping[str, Any]
+) -> vol.Schema:
+    """Build the schema for the list selection form, with defaults from data."""
+    return vol.Schema(
+        {
+            vol.Required(
+                "lists_to_sync", default=data.get("lists_to_sync", [])
+            ): cv.multi_select(list_options),
+            vol.Optional(
+                "list_item_case",
+                default=data.get("list_item_case", ListCase.NO_CHANGE.value),
+            ): SELECTOR_LIST_CASE,
+            vol.Optional("list_prefix", default=data.get("list_prefix", "")): str,
+            vol.Optional(
+                "list_auto_sort", default=data.get("list_auto_sort", False)
+            ): bool,
+            vol.Optional(
+                "list_item_service_events",
+                default=data.get("list_item_service_events", True),
+            ): bool,
+        }
+    )
+
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
     """Handle options for the Google Keep Sync integration."""
@@ -55,19 +121,23 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        data = self.config_entry.data
         errors = {}
         lists = []
 
         if user_input is not None:
             # Update the config entry with new data
-            updated_data = {
-                **self.config_entry.data,
-                **user_input,
-                "list_auto_sort": user_input.get("list_auto_sort", False),
-                "list_item_case": user_input.get(
+            updated_data = dict(data)
+            updated_data.update(
+                user_input,
+                list_auto_sort=user_input.get("list_auto_sort", False),
+                list_item_case=user_input.get(
                     "list_item_case", ListCase.NO_CHANGE.value
                 ),
-            }
+                list_item_service_events=user_input.get(
+                    "list_item_service_events", True
+                ),
+            )
             self.hass.config_entries.async_update_entry(
                 self.config_entry, data=updated_data
             )
@@ -76,14 +146,15 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         try:
-            api = GoogleKeepAPI(
-                self.hass,
-                self.config_entry.data["username"],
-                self.config_entry.data["password"],
-            )
+            # Reuse the authenticated API of the loaded integration if possible
+            coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+            if coordinator is not None:
+                api = coordinator.api
+            else:
+                api = GoogleKeepAPI(self.hass, data["username"], data["password"])
 
-            if not await api.authenticate():
-                return self.async_abort(reason="reauth_required")
+                if not await api.authenticate():
+                    return self.async_abort(reason="reauth_required")
 
             lists = await api.fetch_all_lists()
 
@@ -91,51 +162,11 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             _LOGGER.error("Error fetching lists: %s", e)
             errors["base"] = "list_fetch_error"
 
-        # Retrieve existing values
-        existing_lists = self.config_entry.data.get("lists_to_sync", [])
-        list_prefix = self.config_entry.data.get("list_prefix", "")
-        auto_sort = self.config_entry.data.get("list_auto_sort", False)
-        list_item_case = self.config_entry.data.get(
-            "list_item_case", ListCase.NO_CHANGE.value
-        )
-
-        # Create a set of existing_lists for quick lookup
-        existing_list_set = set(existing_lists)
-
-        # Select all lists that are not deleted, trashed or archived. Keep
-        # lists if we already had them selected previously
-        lists = [
-            list
-            for list in lists
-            if (not list.deleted and not list.trashed and not list.archived)
-            or list.id in existing_list_set
-        ]
-
-        # Sort the lists by name
-        lists.sort(key=lambda x: x.title)
+        list_options = _build_list_options(lists, data.get("lists_to_sync", []))
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
-                {
-                    vol.Required(
-                        "lists_to_sync", default=existing_lists
-                    ): cv.multi_select({list.id: list.title for list in lists}),
-                    vol.Optional(
-                        "list_item_case", default=list_item_case
-                    ): selector.SelectSelector(
-                        selector.SelectSelectorConfig(
-                            options=[
-                                selector.SelectOptionDict(value=key, label=value)
-                                for key, value in CHOICES_LIST_CASE.items()
-                            ],
-                            mode=selector.SelectSelectorMode.DROPDOWN,
-                        )
-                    ),
-                    vol.Optional("list_prefix", default=list_prefix): str,
-                    vol.Optional("list_auto_sort", default=auto_sort): bool,
-                }
-            ),
+            data_schema=_build_options_schema(list_options, data),
             errors=errors,
         )
 
@@ -202,7 +233,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
             raise BlankUsernameError
 
         # Validate email address
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", username):
+        if not EMAIL_PATTERN.match(username):
             raise InvalidEmailError
 
         # Check password and token conditions
@@ -212,10 +243,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
             raise NeitherPasswordNorTokenError
 
         # Validate token format
-        valid_token_length = 223
-        if token and (
-            not token.startswith("aas_et/") or len(token) != valid_token_length
-        ):
+        if token and (len(token) != TOKEN_LENGTH or not token.startswith(TOKEN_PREFIX)):
             raise InvalidTokenFormatError
 
         self.api = GoogleKeepAPI(hass, username, password, token)
@@ -293,66 +321,32 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            entry_data = {
-                **self.user_data,
-                "lists_to_sync": user_input.get("lists_to_sync", []),
-                "list_prefix": user_input.get("list_prefix", ""),
-                "list_auto_sort": user_input.get("list_auto_sort", False),
-                "list_item_case": user_input.get(
+            entry_data = dict(
+                self.user_data,
+                lists_to_sync=user_input.get("lists_to_sync", []),
+                list_prefix=user_input.get("list_prefix", ""),
+                list_auto_sort=user_input.get("list_auto_sort", False),
+                list_item_case=user_input.get(
                     "list_item_case", ListCase.NO_CHANGE.value
                 ),
-            }
+                list_item_service_events=user_input.get(
+                    "list_item_service_events", True
+                ),
+            )
             return self.async_create_entry(
                 title=self.context["unique_id"], data=entry_data
             )
 
-        # Get existing configuration options
-        existing_lists = self.user_data.get("lists_to_sync", [])
-        list_prefix = self.user_data.get("list_prefix", "")
-        auto_sort = self.user_data.get("list_auto_sort", False)
-        list_item_case = self.user_data.get("list_item_case", ListCase.NO_CHANGE.value)
-
         # Fetch all lists from Google Keep to display as options
         lists = await self.api.fetch_all_lists()
 
-        # Create a set of existing_lists for quick lookup
-        existing_list_set = set(existing_lists)
-
-        # Select all lists that are not deleted, trashed or archived
-        lists = [
-            list
-            for list in lists
-            if (not list.deleted and not list.trashed and not list.archived)
-            or list.id in existing_list_set
-        ]
-
-        # Sort the lists by name
-        lists.sort(key=lambda x: x.title)
-
-        options_schema = vol.Schema(
-            {
-                vol.Required("lists_to_sync", default=existing_lists): cv.multi_select(
-                    {list.id: list.title for list in lists}
-                ),
-                vol.Optional(
-                    "list_item_case", default=list_item_case
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[
-                            selector.SelectOptionDict(value=key, label=value)
-                            for key, value in CHOICES_LIST_CASE.items()
-                        ],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
-                vol.Optional("list_prefix", default=list_prefix): str,
-                vol.Optional("list_auto_sort", default=auto_sort): bool,
-            }
+        list_options = _build_list_options(
+            lists, self.user_data.get("lists_to_sync", [])
         )
 
         return self.async_show_form(
             step_id="options",
-            data_schema=options_schema,
+            data_schema=_build_options_schema(list_options, self.user_data),
             errors=errors,
         )
 
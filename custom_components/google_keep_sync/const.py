@@ -4,3 +4,4 @@ from datetime import timedelta
 
 DOMAIN = "google_keep_sync"
 SCAN_INTERVAL = timedelta(minutes=15)
+EVENT_NEW_ITEMS = f"{DOMAIN}_new_items"
@@ -1,24 +1,27 @@
 """DataUpdateCoordinator for the Google Keep Sync component."""
 
+import asyncio
 import logging
 from collections import namedtuple
+from datetime import datetime
 
 from gkeepapi.node import List as GKeepList
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EVENT_CALL_SERVICE, Platform
-from homeassistant.core import EventOrigin, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, EventOrigin, HomeAssistant, callback
 from homeassistant.helpers import entity_registry
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     TimestampDataUpdateCoordinator,
     UpdateFailed,
 )
 
 from .api import GoogleKeepAPI, ListCase
-from .const import DOMAIN, SCAN_INTERVAL
+from .const import DOMAIN, EVENT_NEW_ITEMS, SCAN_INTERVAL
 
 _LOGGER = logging.getLogger(__name__)
-TodoItem = namedtuple("TodoItem", ["summary", "checked"])
-TodoList = namedtuple("TodoList", ["name", "items"])
+NEW_ITEM_EVENT_BATCH_SIZE = 50
+TodoSnapshot = namedtuple("TodoSnapshot", ["lists", "items"])
 TodoItemData = namedtuple("TodoItemData", ["item", "entity_id"])
 
 
@@ -40,13 +43,50 @@ class GoogleKeepSyncCoordinator(TimestampDataUpdateCoordinator[list[GKeepList]])
         )
         self.api = api
         self.config_entry = entry
+        self._last_snapshot: TodoSnapshot | None = None
+        self._unsub_scheduled_refresh: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_schedule_refresh(self, delay: float) -> bool:
+        """Schedule a refresh after a delay, unless one is already scheduled.
+
+        Returns True if a new refresh was scheduled.
+        """
+        if self._unsub_scheduled_refresh is not None:
+            return False
+
+        self._unsub_scheduled_refresh = async_call_later(
+            self.hass, delay, self._async_scheduled_refresh
+        )
+        return True
+
+    async def _async_scheduled_refresh(self, _now: datetime) -> None:
+        """Run a refresh that was scheduled with async_schedule_refresh."""
+        self._unsub_scheduled_refresh = None
+        await self.async_refresh()
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled refresh and pending push, save and shut down."""
+        if self._unsub_scheduled_refresh is not None:
+            self._unsub_scheduled_refresh()
+            self._unsub_scheduled_refresh = None
+        await self.api.async_shutdown()
+        await self.api.async_save_state()
+        await super().async_shutdown()
+
+    def invalidate_snapshot(self) -> None:
+        """Discard the cached snapshot after the lists were changed locally."""
+        self._last_snapshot = None
 
     # Define the update method for the coordinator
     async def _async_update_data(self) -> list[GKeepList]:
         """Fetch data from API."""
         try:
-            # save lists prior to syncing
-            original_lists = await self._parse_gkeep_data_dict()
+            # Reuse the snapshot taken after the previous sync, unless the
+            # lists were changed locally since then
+            original_lists = self._last_snapshot
+            if original_lists is None:
+                original_lists = self._parse_gkeep_data_dict()
 
             # Sync data with Google Keep
             lists_to_sync = self.config_entry.data.get("lists_to_sync", [])
@@ -60,86 +100,115 @@ class GoogleKeepSyncCoordinator(TimestampDataUpdateCoordinator[list[GKeepList]])
             )
 
             # save lists after syncing
-            updated_lists = await self._parse_gkeep_data_dict()
+            updated_lists = self._parse_gkeep_data_dict()
             # compare both list for changes, and fire event for changes
-            new_items = await self._get_new_items_added(
+            new_items = self._get_new_items_added(
                 original_lists,
                 updated_lists,
             )
             await self._notify_new_items(new_items)
+            self._last_snapshot = updated_lists
 
             return result
         except Exception as error:
             raise UpdateFailed(f"Error communicating with API: {error}") from error
 
-    async def _parse_gkeep_data_dict(self) -> dict[str, TodoList]:
-        """Parse unchecked gkeep data to a dictionary, with the list id as the key."""
-        all_keep_lists = {}
+    def _parse_gkeep_data_dict(self) -> TodoSnapshot:
+        """Parse unchecked gkeep data to a snapshot of list names and items.
+
+        Items are keyed by a (list id, item id) tuple and map to their summary.
+        """
+        list_names: dict[str, str] = {}
+        items: dict[tuple[str, str], str] = {}
 
         # for each list
         for keep_list in self.data or []:
+            list_id = keep_list.id
+            list_names[list_id] = keep_list.title
+
             # get all the unchecked items only
-            items = {
-                item.id: TodoItem(summary=item.text, checked=item.checked)
-                for item in keep_list.items
-                if not item.checked
-            }
-            all_keep_lists[keep_list.id] = TodoList(name=keep_list.title, items=items)
-        return all_keep_lists
+            for item in keep_list.items:
+                if not item.checked:
+                    items[(list_id, item.id)] = item.text
 
-    async def _get_new_items_added(
+        return TodoSnapshot(lists=list_names, items=items)
+
+    def _get_new_items_added(
         self,
-        original_lists: dict[str, TodoList],
-        updated_lists: dict[str, TodoList],
+        original_lists: TodoSnapshot,
+        updated_lists: TodoSnapshot,
     ) -> list[TodoItemData]:
-        """Compare original and updated lists to find new TodoItems.
+        """Compare original and updated snapshots to find new TodoItems.
 
-        For each new TodoItem found, call the provided on_new_item callback.
+        Items in lists that are not part of the original snapshot are ignored.
 
-        :param original_lists: The original todo list data.
-        :param updated_lists: The updated todo list data.
-        # :param on_new_item: Callback function to execute for each new item found.
+        :param original_lists: The original todo list snapshot.
+        :param updated_lists: The updated todo list snapshot.
         """
         new_items = []
-        # for each list
-        for updated_list_id, updated_list in updated_lists.items():
-            if updated_list_id not in original_lists:
-                _LOGGER.debug("Found new list not in original: %s", updated_list.name)
+        list_entity_ids: dict[str, str | None] = {}
+        entity_reg = None
+
+        # Only walk the lists and log each item when debug logging is enabled
+        debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+
+        if debug_enabled:
+            for list_id, list_name in updated_lists.lists.items():
+                if list_id not in original_lists.lists:
+                    _LOGGER.debug("Found new list not in original: %s", list_name)
+
+        # for each todo item that is not in the original snapshot
+        original_items = original_lists.items
+        for key, summary in updated_lists.items.items():
+            list_id = key[0]
+            if key in original_items or list_id not in original_lists.lists:
                 continue
 
-            # for each todo item in the list
-            updated_list_item: TodoItem
-            for (
-                updated_list_item_id,
-                updated_list_item,
-            ) in updated_list.items.items():
-                # get original list with updated_list_id
-                original_list = original_lists[updated_list_id]
-
-                # if todo is not in original list, then it is new
-                if updated_list_item_id not in original_list.items:
-                    # Get HA List entity_id for _gkeep_list_id
+            # Get HA List entity_id for _gkeep_list_id
+            if list_id not in list_entity_ids:
+                if entity_reg is None:
                     entity_reg = entity_registry.async_get(self.hass)
-                    uuid = f"{DOMAIN}.list.{updated_list_id}"
-                    list_entity_id = entity_reg.async_get_entity_id(
-                        Platform.TODO, DOMAIN, uuid
-                    )
-                    new_items.append(
-                        TodoItemData(
-                            item=updated_list_item.summary, entity_id=list_entity_id
-                        )
-                    )
-
-                    _LOGGER.debug(
-                        "Found new TodoItem: '%s' in List entity_id: '%s'",
-                        updated_list_item.summary,
-                        list_entity_id,
-                    )
+                uuid = f"{DOMAIN}.list.{list_id}"
+                list_entity_ids[list_id] = entity_reg.async_get_entity_id(
+                    Platform.TODO, DOMAIN, uuid
+                )
+            list_entity_id = list_entity_ids[list_id]
+
+            new_items.append(TodoItemData(item=summary, entity_id=list_entity_id))
+
+            if debug_enabled:
+                _LOGGER.debug(
+                    "Found new TodoItem: '%s' in List entity_id: '%s'",
+                    summary,
+                    list_entity_id,
+                )
         return new_items
 
     async def _notify_new_items(self, new_items: list[TodoItemData]) -> None:
-        """Emit add_item service call event for new remote Todo items."""
-        for new_item in new_items:
+        """Emit events for new remote Todo items.
+
+        A single event is fired with all new items. Unless disabled in the
+        options, it is followed by an add_item service call event for each item.
+        """
+        if not new_items:
+            return
+
+        async_fire = self.hass.bus.async_fire
+        async_fire(
+            EVENT_NEW_ITEMS,
+            {
+                "items": [
+                    {"item": new_item.item, "entity_id": new_item.entity_id}
+                    for new_item in new_items
+                ]
+            },
+            origin=EventOrigin.remote,
+        )
+
+        if not self.config_entry.data.get("list_item_service_events", True):
+            return
+
+        for index, new_item in enumerate(new_items, 1):
             event_data = {
                 "domain": "todo",
                 "service": "add_item",
@@ -148,6 +217,8 @@ class GoogleKeepSyncCoordinator(TimestampDataUpdateCoordinator[list[GKeepList]])
                     "entity_id": [new_item.entity_id],
                 },
             }
-            self.hass.bus.async_fire(
-                EVENT_CALL_SERVICE, event_data, origin=EventOrigin.remote
-            )
+            async_fire(EVENT_CALL_SERVICE, event_data, origin=EventOrigin.remote)
+
+            # Yield to the event loop regularly when many items were added
+            if index % NEW_ITEM_EVENT_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
@@ -76,7 +76,7 @@ class GoogleKeepTodoListEntity(
                 )
 
         # Resync data with Google Keep
-        await self.coordinator.async_refresh()
+        await self._async_refresh_after_change()
         _LOGGER.debug("Requested data refresh.")
 
     async def async_update_todo_item(self, item: TodoItem) -> None:
@@ -96,7 +96,7 @@ class GoogleKeepTodoListEntity(
 
         finally:
             # Resync data with Google Keep
-            await self.coordinator.async_refresh()
+            await self._async_refresh_after_change()
             _LOGGER.debug("Requested data refresh and updated Home Assistant UI.")
 
     async def async_create_todo_item(self, item: TodoItem) -> None:
@@ -117,9 +117,20 @@ class GoogleKeepTodoListEntity(
 
         finally:
             # Request refresh to synchronize with Google Keep
-            await self.coordinator.async_refresh()
+            await self._async_refresh_after_change()
             _LOGGER.debug("Requested data refresh and updated Home Assistant UI.")
 
+    async def _async_refresh_after_change(self) -> None:
+        """Show a local change right away and request a sync with Google Keep.
+
+        The change is already applied to the in-memory Keep list, so the new
+        state can be written before syncing. The coordinator debounces refresh
+        requests, so a burst of changes results in a single trailing sync.
+        """
+        self.coordinator.invalidate_snapshot()
+        self.async_write_ha_state()
+        await self.coordinator.async_request_refresh()
+
     @property
     def todo_items(self) -> list[TodoItem]:
         """Get the current set of To-do items."""
@@ -143,13 +154,11 @@ async def async_setup_entry(
     """Set up the Google Keep todo platform."""
     coordinator: GoogleKeepSyncCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Retrieve user-selected lists from the configuration
-    selected_lists = entry.data.get("lists_to_sync", [])
     list_prefix = entry.data.get("list_prefix", "")
 
-    # Filter Google Keep lists based on user selection
-    all_lists = await coordinator.api.fetch_all_lists()
-    lists_to_sync = [lst for lst in all_lists if lst.id in selected_lists]
+    # The first refresh of the coordinator has already synced the lists
+    # selected by the user, so use them instead of syncing all lists again
+    lists_to_sync = coordinator.data or []
 
     async_add_entities(
         [
@@ -1,11 +1,20 @@
 """Tests for GoogleKeepAPI."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import gkeepapi
 import pytest
 
-from custom_components.google_keep_sync.api import GoogleKeepAPI, ListCase
+from custom_components.google_keep_sync.api import (
+    LISTS_CACHE_TTL,
+    STATE_SAVE_DELAY,
+    STATE_SAVE_INTERVAL,
+    SYNC_BACKOFF_JITTER,
+    SYNC_MAX_RETRIES,
+    GoogleKeepAPI,
+    ListCase,
+)
 
 # Constants for testing
 TEST_USERNAME = "testuser@example.com"
@@ -144,6 +153,49 @@ async def test_authenticate_failed_resume(google_keep_api, mock_hass, mock_store
     assert google_keep_api._authenticated is False
 
 
+async def test_authenticate_resync_required(google_keep_api, mock_hass, mock_store):
+    """Test that a stale saved state falls back to the saved token."""
+    mock_store.async_load.return_value = {
+        "token": TEST_TOKEN,
+        "state": TEST_STATE,
+        "username": TEST_USERNAME,
+    }
+    google_keep_api._store = mock_store
+    google_keep_api._keep.resume = AsyncMock(
+        side_effect=[gkeepapi.exception.ResyncRequiredException, None]
+    )
+
+    result = await google_keep_api.authenticate()
+
+    assert result is True
+    google_keep_api._keep.resume.assert_called_with(TEST_USERNAME, TEST_TOKEN, None)
+    google_keep_api._keep.login.assert_not_called()
+
+
+async def test_authenticate_already_authenticated(
+    google_keep_api, mock_hass, mock_store
+):
+    """Test that no login is attempted when already authenticated."""
+    google_keep_api._authenticated = True
+    google_keep_api._store = mock_store
+
+    assert await google_keep_api.authenticate() is True
+
+    mock_store.async_load.assert_not_called()
+    google_keep_api._keep.resume.assert_not_called()
+    google_keep_api._keep.login.assert_not_called()
+
+
+async def test_authenticated_required(google_keep_api, mock_hass):
+    """Test that API calls fail when not authenticated."""
+    google_keep_api._authenticated = False
+
+    with pytest.raises(Exception, match="Not authenticated"):
+        await google_keep_api.async_create_todo_item(TEST_LIST_ID, TEST_ITEM_TEXT)
+
+    google_keep_api._keep.get.assert_not_called()
+
+
 async def test_async_create_todo_item(google_keep_api, mock_hass):
     """Test creating a new todo item."""
     google_keep_api._authenticated = True
@@ -156,13 +208,14 @@ async def test_async_create_todo_item(google_keep_api, mock_hass):
     mock_gkeep_list.items = [mock_new_item]
     google_keep_api._keep.get.return_value = mock_gkeep_list
 
-    # Mock the 'add' method as an async function
-    async def async_add_item(text, checked):
-        mock_gkeep_list.items.append(
-            MagicMock(id="milk_item_id", text=text, checked=checked)
-        )
+    # Mock the 'add' method
+    def add_item(text, checked):
+        new_item = MagicMock(id="milk_item_id", text=text, checked=checked)
+        mock_gkeep_list.items.append(new_item)
+        return new_item
 
-    mock_gkeep_list.add = AsyncMock(side_effect=async_add_item)
+    mock_gkeep_list.add = MagicMock(side_effect=add_item)
+    google_keep_api._item_index = {list_id: {}}
 
     # Adding a new item
     await google_keep_api.async_create_todo_item(list_id, item_text)
@@ -170,6 +223,7 @@ async def test_async_create_todo_item(google_keep_api, mock_hass):
     # Assertions
     google_keep_api._keep.get.assert_called_with(list_id)
     mock_gkeep_list.add.assert_called_with(item_text, False)
+    assert google_keep_api._item_index[list_id]["milk_item_id"].text == item_text
 
 
 async def test_async_delete_todo_item(google_keep_api, mock_hass):
@@ -184,7 +238,7 @@ async def test_async_delete_todo_item(google_keep_api, mock_hass):
     mock_gkeep_list.items = [mock_target_item]
     google_keep_api._keep.get.return_value = mock_gkeep_list
 
-    mock_target_item.delete = AsyncMock()
+    mock_target_item.delete = MagicMock()
 
     # Deleting the item
     await google_keep_api.async_delete_todo_item(list_id, item_id)
@@ -216,6 +270,51 @@ async def test_async_update_todo_item(google_keep_api, mock_hass):
     assert mock_target_item.checked is True
 
 
+async def test_async_update_todo_item_indexed(google_keep_api, mock_hass):
+    """Test that a list is indexed on its first lookup and reused until a sync."""
+    google_keep_api._authenticated = True
+    list_id = "grocery_list_id"
+    item_id = "milk_item_id"
+
+    mock_gkeep_list = MagicMock(spec=gkeepapi.node.List)
+    mock_gkeep_list.id = list_id
+    mock_target_item = MagicMock(id=item_id, text="Milk", checked=False, deleted=False)
+    mock_gkeep_list.items = [mock_target_item]
+    google_keep_api._keep.get = MagicMock(return_value=mock_gkeep_list)
+
+    await google_keep_api.async_sync_data([list_id])
+    assert google_keep_api._item_index == {}
+
+    await google_keep_api.async_update_todo_item(list_id, item_id, new_text="Eggs")
+    assert google_keep_api._item_index == {list_id: {item_id: mock_target_item}}
+
+    # Items are found through the index once the list has been indexed
+    mock_gkeep_list.items = []
+    await google_keep_api.async_update_todo_item(list_id, item_id, checked=True)
+    assert mock_target_item.checked is True
+
+    # The next sync drops the index
+    await google_keep_api.async_sync_data([list_id])
+    assert google_keep_api._item_index == {}
+
+
+async def test_async_update_todo_item_indexed_deleted(google_keep_api, mock_hass):
+    """Test that deleted items in the index are not returned."""
+    google_keep_api._authenticated = True
+    list_id = "grocery_list_id"
+    item_id = "milk_item_id"
+
+    mock_gkeep_list = MagicMock(spec=gkeepapi.node.List)
+    mock_target_item = MagicMock(id=item_id, text="Milk", checked=False, deleted=True)
+    mock_gkeep_list.items = []
+    google_keep_api._keep.get = MagicMock(return_value=mock_gkeep_list)
+    google_keep_api._item_index = {list_id: {item_id: mock_target_item}}
+
+    await google_keep_api.async_update_todo_item(list_id, item_id, new_text="Eggs")
+
+    assert mock_target_item.text == "Milk"
+
+
 async def test_fetch_all_lists(google_keep_api, mock_hass):
     """Test fetching all lists from Google Keep."""
     google_keep_api._authenticated = True
@@ -232,6 +331,41 @@ async def test_fetch_all_lists(google_keep_api, mock_hass):
     google_keep_api._keep.all.assert_called_once()
 
 
+async def test_fetch_all_lists_after_sync(google_keep_api, mock_hass):
+    """Test that fetching lists right after a sync does not sync again."""
+    google_keep_api._authenticated = True
+    google_keep_api._keep.all.return_value = []
+
+    await google_keep_api.fetch_all_lists()
+    await google_keep_api.fetch_all_lists()
+    google_keep_api._keep.sync.assert_called_once()
+
+    # Once the last sync is old enough, the lists are synced again
+    google_keep_api._last_sync_time -= LISTS_CACHE_TTL
+    await google_keep_api.fetch_all_lists()
+
+    expected_sync_call_count = 2
+    assert google_keep_api._keep.sync.call_count == expected_sync_call_count
+
+
+async def test_fetch_all_lists_cached(google_keep_api, mock_hass):
+    """Test that the lists are only collected again when the Keep version changes."""
+    google_keep_api._authenticated = True
+    mock_list = MagicMock(spec=gkeepapi.node.List)
+    google_keep_api._keep.all.return_value = [mock_list]
+    google_keep_api._keep._keep_version = "version_1"
+
+    assert await google_keep_api.fetch_all_lists() == [mock_list]
+    assert await google_keep_api.fetch_all_lists() == [mock_list]
+    google_keep_api._keep.all.assert_called_once()
+
+    google_keep_api._keep._keep_version = "version_2"
+    await google_keep_api.fetch_all_lists()
+
+    expected_all_call_count = 2
+    assert google_keep_api._keep.all.call_count == expected_all_call_count
+
+
 async def test_async_sync_data(google_keep_api, mock_hass):
     """Test synchronizing data with Google Keep."""
     google_keep_api._authenticated = True
@@ -246,7 +380,7 @@ async def test_async_sync_data(google_keep_api, mock_hass):
         if list_id == "grocery_list_id":
             return mock_list
 
-    google_keep_api._keep.get = AsyncMock(side_effect=get_side_effect)
+    google_keep_api._keep.get = MagicMock(side_effect=get_side_effect)
 
     # Syncing data
     lists = await google_keep_api.async_sync_data(["grocery_list_id"])
@@ -271,6 +405,52 @@ async def test_async_sync_data(google_keep_api, mock_hass):
     google_keep_api._keep.get.assert_called_once()
 
 
+async def test_async_sync_data_no_lists(google_keep_api, mock_hass):
+    """Test that no sync is done when there are no lists to sync."""
+    google_keep_api._authenticated = True
+
+    lists = await google_keep_api.async_sync_data([])
+
+    assert lists == []
+    google_keep_api._keep.sync.assert_not_called()
+
+
+async def test_async_sync_data_saves_state_periodically(
+    google_keep_api, mock_hass, mock_store
+):
+    """Test that the state is only saved every STATE_SAVE_INTERVAL syncs."""
+    google_keep_api._authenticated = True
+    google_keep_api._token = TEST_TOKEN
+    google_keep_api._store = mock_store
+    google_keep_api._keep.sync = AsyncMock()
+    google_keep_api._keep.dump = AsyncMock(return_value=TEST_STATE)
+    google_keep_api._keep.get = MagicMock(return_value=MagicMock(items=[]))
+
+    for _ in range(STATE_SAVE_INTERVAL - 1):
+        await google_keep_api.async_sync_data([TEST_LIST_ID])
+    mock_store.async_delay_save.assert_not_called()
+
+    await google_keep_api.async_sync_data([TEST_LIST_ID])
+    mock_store.async_delay_save.assert_called_once()
+
+
+async def test_async_sync_data_missing_list(google_keep_api, mock_hass, caplog):
+    """Test that a selected list that no longer exists in Keep is skipped."""
+    google_keep_api._authenticated = True
+
+    mock_list = MagicMock(spec=gkeepapi.node.List)
+    mock_list.id = TEST_LIST_ID
+    mock_list.items = []
+    google_keep_api._keep.get = MagicMock(
+        side_effect=lambda list_id: mock_list if list_id == TEST_LIST_ID else None
+    )
+
+    lists = await google_keep_api.async_sync_data(["deleted_list_id", TEST_LIST_ID])
+
+    assert lists == [mock_list]
+    assert "List deleted_list_id not found in Google Keep" in caplog.text
+
+
 async def test_async_sync_data_sort_unchecked(google_keep_api, mock_hass):
     """Test synchronizing and sorting data with Google Keep."""
     google_keep_api._authenticated = True
@@ -285,10 +465,10 @@ async def test_async_sync_data_sort_unchecked(google_keep_api, mock_hass):
     mock_list.unchecked = [mock_item1, mock_item2]
 
     # Mocking sort_items method
-    mock_list.sort_items = AsyncMock()
+    mock_list.sort_items = MagicMock()
 
     # Side effect to return the mock list
-    google_keep_api._keep.get = AsyncMock(return_value=mock_list)
+    google_keep_api._keep.get = MagicMock(return_value=mock_list)
 
     # Mocking the is_list_sorted method
     google_keep_api.is_list_sorted = MagicMock(return_value=False)
@@ -306,10 +486,201 @@ async def test_async_sync_data_sort_unchecked(google_keep_api, mock_hass):
     assert lists[0].items == [mock_item1, mock_item2]
 
     # Check if sync was called twice, once at the beginning and once after sorting
+    await mock_hass.async_create_background_task.call_args.args[0]
     expected_sync_call_count = 2
     assert google_keep_api._keep.sync.call_count == expected_sync_call_count
 
 
+async def test_async_sync_data_change_case(google_keep_api, mock_hass):
+    """Test synchronizing data and changing the case of list items."""
+    google_keep_api._authenticated = True
+
+    mock_list = MagicMock(spec=gkeepapi.node.List)
+    mock_list.id = "todo_list_id"
+    mock_item = MagicMock(id="milk_item_id", text="Milk", checked=False)
+    mock_list.items = [mock_item]
+    google_keep_api._keep.get = MagicMock(return_value=mock_list)
+
+    await google_keep_api.async_sync_data(["todo_list_id"], change_case=ListCase.UPPER)
+
+    # The case change runs on the event loop, only the syncs use the executor
+    assert mock_item.text == "MILK"
+    await mock_hass.async_create_background_task.call_args.args[0]
+    expected_sync_call_count = 2
+    assert google_keep_api._keep.sync.call_count == expected_sync_call_count
+    assert mock_hass.async_add_executor_job.call_count == expected_sync_call_count
+
+
+async def test_async_shutdown_cancels_push(google_keep_api, mock_hass):
+    """Test that shutting down cancels a pending push of local changes."""
+    google_keep_api._authenticated = True
+    mock_hass.async_create_background_task.side_effect = (
+        lambda coro, name: asyncio.get_running_loop().create_task(coro)
+    )
+    mock_item = MagicMock(id="milk_item_id", text="Milk", checked=False)
+    google_keep_api._keep.get = MagicMock(return_value=MagicMock(items=[mock_item]))
+
+    await google_keep_api.async_sync_data([TEST_LIST_ID], change_case=ListCase.UPPER)
+    assert len(google_keep_api._push_tasks) == 1
+
+    await google_keep_api.async_shutdown()
+    await asyncio.sleep(0)
+
+    # Only the sync of async_sync_data ran, the push was cancelled
+    google_keep_api._keep.sync.assert_called_once()
+    assert not google_keep_api._push_tasks
+
+
+async def test_async_shutdown_waits_for_running_sync(google_keep_api, mock_hass):
+    """Test that cancelling a push keeps the lock until its sync has finished."""
+    sync_started = asyncio.Event()
+    finish_sync = asyncio.Event()
+
+    async def slow_sync():
+        sync_started.set()
+        await finish_sync.wait()
+
+    google_keep_api._keep.sync = AsyncMock(side_effect=slow_sync)
+    push_task = asyncio.get_running_loop().create_task(
+        google_keep_api._async_push_changes()
+    )
+    google_keep_api._push_tasks.add(push_task)
+    await sync_started.wait()
+
+    shutdown_task = asyncio.get_running_loop().create_task(
+        google_keep_api.async_shutdown()
+    )
+    # Let the cancellation reach the push task
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    # The push was cancelled, but its sync is still running
+    assert not shutdown_task.done()
+    assert google_keep_api._sync_lock.locked()
+
+    finish_sync.set()
+    await shutdown_task
+
+    assert push_task.cancelled()
+    assert not google_keep_api._sync_lock.locked()
+
+
+async def test_async_update_todo_item_waits_for_sync(google_keep_api):
+    """Test that items are not modified while a sync is running."""
+    google_keep_api._authenticated = True
+    mock_item = MagicMock(id="milk_item_id", text="Milk", checked=False)
+    google_keep_api._keep.get = MagicMock(
+        return_value=MagicMock(spec=gkeepapi.node.List, items=[mock_item])
+    )
+
+    await google_keep_api._sync_lock.acquire()
+    update_task = asyncio.get_running_loop().create_task(
+        google_keep_api.async_update_todo_item(TEST_LIST_ID, "milk_item_id", "Eggs")
+    )
+    await asyncio.sleep(0)
+    assert mock_item.text == "Milk"
+
+    google_keep_api._sync_lock.release()
+    await update_task
+    assert mock_item.text == "Eggs"
+
+
+async def test_async_push_changes_failed(google_keep_api, mock_hass, caplog):
+    """Test that a failed push of local changes is logged and not raised."""
+    google_keep_api._keep.sync = AsyncMock(
+        side_effect=gkeepapi.exception.SyncException("sync failed")
+    )
+
+    await google_keep_api._async_push_changes()
+
+    assert "Failed to push changes to Google Keep" in caplog.text
+
+
+async def test_async_sync_rate_limited(google_keep_api, mock_hass):
+    """Test that a rate limited sync is retried after backing off."""
+    rate_limit_error = gkeepapi.exception.APIException(
+        429, {"code": 429, "details": [{"retryDelay": "7s"}]}
+    )
+    google_keep_api._keep.sync = AsyncMock(side_effect=[rate_limit_error, None])
+
+    with patch("asyncio.sleep", AsyncMock()) as mock_sleep:
+        await google_keep_api._async_sync()
+
+    expected_sync_call_count = 2
+    assert google_keep_api._keep.sync.call_count == expected_sync_call_count
+    mock_sleep.assert_called_once()
+    assert mock_sleep.call_args.args[0] == pytest.approx(7, abs=0.1)
+
+
+async def test_async_sync_rate_limited_zero_retry_delay(google_keep_api, mock_hass):
+    """Test that a zero retry delay from the server is honoured."""
+    rate_limit_error = gkeepapi.exception.APIException(
+        429, {"code": 429, "details": [{"retryDelay": "0s"}]}
+    )
+    google_keep_api._keep.sync = AsyncMock(side_effect=[rate_limit_error, None])
+    google_keep_api._get_backoff = MagicMock(return_value=30)
+
+    with patch("asyncio.sleep", AsyncMock()) as mock_sleep:
+        await google_keep_api._async_sync()
+
+    expected_sync_call_count = 2
+    assert google_keep_api._keep.sync.call_count == expected_sync_call_count
+    google_keep_api._get_backoff.assert_not_called()
+    mock_sleep.assert_not_called()
+
+
+async def test_async_sync_rate_limited_releases_lock(google_keep_api, mock_hass):
+    """Test that the sync lock is not held while backing off."""
+    rate_limit_error = gkeepapi.exception.APIException(
+        429, {"code": 429, "details": [{"retryDelay": "7s"}]}
+    )
+    google_keep_api._keep.sync = AsyncMock(side_effect=[rate_limit_error, None])
+    lock_states = []
+
+    async def record_lock(_delay):
+        lock_states.append(google_keep_api._sync_lock.locked())
+
+    with patch("asyncio.sleep", AsyncMock(side_effect=record_lock)):
+        await google_keep_api._async_sync()
+
+    assert lock_states == [False]
+
+
+async def test_get_backoff_jitter(google_keep_api):
+    """Test that the exponential backoff is varied within the jitter range."""
+    attempt = 3
+    base_backoff = 2**attempt
+
+    for _ in range(20):
+        backoff = google_keep_api._get_backoff(attempt)
+        assert base_backoff * (1 - SYNC_BACKOFF_JITTER) <= backoff
+        assert backoff <= base_backoff * (1 + SYNC_BACKOFF_JITTER)
+
+
+async def test_async_sync_rate_limit_exhausted(google_keep_api, mock_hass):
+    """Test that the error is raised once all retries are exhausted."""
+    rate_limit_error = gkeepapi.exception.APIException(429, {"code": 429})
+    google_keep_api._keep.sync = AsyncMock(side_effect=rate_limit_error)
+
+    with patch("asyncio.sleep", AsyncMock()), pytest.raises(
+        gkeepapi.exception.APIException
+    ):
+        await google_keep_api._async_sync()
+
+    assert google_keep_api._keep.sync.call_count == SYNC_MAX_RETRIES + 1
+
+
+async def test_async_sync_other_api_error(google_keep_api, mock_hass):
+    """Test that errors other than rate limiting are not retried."""
+    server_error = gkeepapi.exception.APIException(500, {"code": 500})
+    google_keep_api._keep.sync = AsyncMock(side_effect=server_error)
+
+    with pytest.raises(gkeepapi.exception.APIException):
+        await google_keep_api._async_sync()
+
+    google_keep_api._keep.sync.assert_called_once()
+
+
 async def test_is_list_sorted(google_keep_api, mock_hass):
     """Tests whether is_list_sorted works as expected."""
     # Create mock items
@@ -332,6 +703,10 @@ async def test_is_list_sorted(google_keep_api, mock_hass):
         google_keep_api.is_list_sorted(not_sorted_list) is False
     ), "The list should be identified as not sorted"
 
+    # Empty and single item lists are always sorted
+    assert google_keep_api.is_list_sorted([]) is True
+    assert google_keep_api.is_list_sorted([item1]) is True
+
 
 async def test_async_login_with_saved_token(google_keep_api, mock_hass):
     """Test logging in to Google Keep using the saved token."""
@@ -425,11 +800,72 @@ async def test_async_save_state_and_token(google_keep_api, mock_hass, mock_store
     # Assertions
     google_keep_api._keep.dump.assert_called_once()
     google_keep_api._keep.getMasterToken.assert_not_called()
-    mock_store.async_save.assert_called_once_with(
+    mock_store.async_delay_save.assert_called_once()
+    data_func, delay = mock_store.async_delay_save.call_args.args
+    assert delay == STATE_SAVE_DELAY
+    assert data_func() == {
+        "token": TEST_TOKEN,
+        "state": TEST_STATE,
+        "username": TEST_USERNAME,
+    }
+
+
+async def test_async_save_state_and_token_unchanged(
+    google_keep_api, mock_hass, mock_store
+):
+    """Test that saving is skipped when the token and Keep version are unchanged."""
+    google_keep_api._token = TEST_TOKEN
+    google_keep_api._store = mock_store
+    google_keep_api._keep._keep_version = "version_1"
+
+    # The first save writes the state, the second one is skipped
+    await google_keep_api._async_save_state_and_token()
+    await google_keep_api._async_save_state_and_token()
+    mock_store.async_delay_save.assert_called_once()
+
+    # A new Keep version writes the state again
+    google_keep_api._keep._keep_version = "version_2"
+    await google_keep_api._async_save_state_and_token()
+
+    expected_save_count = 2
+    assert mock_store.async_delay_save.call_count == expected_save_count
+
+
+async def test_async_save_state_and_token_forced(
+    google_keep_api, mock_hass, mock_store
+):
+    """Test that a forced save is written immediately, even if unchanged."""
+    google_keep_api._token = TEST_TOKEN
+    google_keep_api._store = mock_store
+    google_keep_api._keep._keep_version = "version_1"
+
+    await google_keep_api._async_save_state_and_token()
+    await google_keep_api._async_save_state_and_token(force=True)
+
+    mock_store.async_delay_save.assert_called_once()
+    mock_store.async_save.assert_awaited_once_with(
         {"token": TEST_TOKEN, "state": TEST_STATE, "username": TEST_USERNAME}
     )
 
 
+async def test_async_save_state_and_token_waits_for_sync(
+    google_keep_api, mock_hass, mock_store
+):
+    """Test that the state is not dumped while a sync holds the lock."""
+    google_keep_api._token = TEST_TOKEN
+    google_keep_api._store = mock_store
+
+    async with google_keep_api._sync_lock:
+        save = asyncio.create_task(
+            google_keep_api._async_save_state_and_token(force=True)
+        )
+        await asyncio.sleep(0)
+        google_keep_api._keep.dump.assert_not_called()
+
+    await save
+    google_keep_api._keep.dump.assert_called_once()
+
+
 async def test_change_list_case(google_keep_api, mock_hass):
     """Test changing the case of list items."""
     # Create a list with items
@@ -450,6 +886,9 @@ async def test_change_list_case(google_keep_api, mock_hass):
     assert mock_item1.text == "milk"
     assert mock_item2.text == "apple"
 
+    # Check that unchanged items are not reported as changed
+    assert google_keep_api.change_list_case(mock_list.items, ListCase.LOWER) is False
+
     # Check no change
     google_keep_api.change_list_case(mock_list.items, ListCase.NO_CHANGE)
     assert mock_item1.text == "milk"
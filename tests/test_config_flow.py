@@ -93,6 +93,7 @@ async def test_user_form_setup(hass: HomeAssistant, mock_google_keep_api):
         "list_prefix": "testprefix",
         "list_auto_sort": False,
         "list_item_case": "no_change",
+        "list_item_service_events": True,
     }
 
 
@@ -525,6 +526,7 @@ async def test_options_flow_create_entry(
         "list_prefix": "Test",
         "list_auto_sort": False,
         "list_item_case": "no_change",
+        "list_item_service_events": False,
     }
 
     # Submit user input
@@ -555,6 +557,29 @@ async def test_options_flow_reauth_required(
     assert init_result["reason"] == "reauth_required"
 
 
+async def test_options_flow_reuses_loaded_api(
+    hass: HomeAssistant, mock_google_keep_api, mock_config_entry
+):
+    """Test options flow uses the API of the loaded integration."""
+    mock_config_entry.add_to_hass(hass)
+
+    mock_list = MagicMock(
+        id="list_id_1", title="List One", deleted=False, archived=False, trashed=False
+    )
+    mock_coordinator = MagicMock()
+    mock_coordinator.api.fetch_all_lists = AsyncMock(return_value=[mock_list])
+    hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
+
+    # Initialize the options flow
+    init_result = await hass.config_entries.options.async_init(
+        mock_config_entry.entry_id
+    )
+
+    assert init_result["type"] == "form"
+    mock_coordinator.api.fetch_all_lists.assert_awaited_once()
+    mock_google_keep_api.assert_not_called()
+
+
 async def test_user_form_cannot_connect(hass: HomeAssistant, mock_google_keep_api):
     """Test the user setup form handles connection issues."""
     mock_instance = mock_google_keep_api.return_value
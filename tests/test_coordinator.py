@@ -1,18 +1,23 @@
 """Unit tests for the todo component."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 from homeassistant.const import EVENT_CALL_SERVICE
-from homeassistant.core import EventOrigin
+from homeassistant.core import EventOrigin, HomeAssistant
 from homeassistant.helpers import entity_registry
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util.dt import utcnow
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
+from custom_components.google_keep_sync.const import EVENT_NEW_ITEMS
 from custom_components.google_keep_sync.coordinator import (
     GoogleKeepSyncCoordinator,
-    TodoItem,
     TodoItemData,
-    TodoList,
+    TodoSnapshot,
 )
 
 
@@ -31,6 +36,8 @@ def mock_api():
     """Return a mocked GoogleKeepAPI."""
     api = MagicMock()
     api.async_create_todo_item = MagicMock()
+    api.async_save_state = AsyncMock()
+    api.async_shutdown = AsyncMock()
     return api
 
 
@@ -49,16 +56,40 @@ async def test_async_update_data(
         assert result == ["list1", "list2"]
 
 
+async def test_async_update_data_reuses_snapshot(
+    mock_api: MagicMock, mock_hass: MagicMock, mock_config_entry: MockConfigEntry
+):
+    """Test that the snapshot from the previous update is reused."""
+    mock_list = MagicMock(id="grocery_list_id", title="Grocery List")
+    mock_list.items = [MagicMock(id="milk_item_id", text="Milk", checked=False)]
+    mock_api.async_sync_data = AsyncMock(return_value=[mock_list])
+
+    coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
+    coordinator.data = [mock_list]
+    await coordinator._async_update_data()
+    snapshot = coordinator._last_snapshot
+    assert ("grocery_list_id", "milk_item_id") in snapshot.items
+
+    with patch.object(
+        coordinator, "_get_new_items_added", MagicMock(return_value=[])
+    ) as mock_get_new_items:
+        await coordinator._async_update_data()
+        assert mock_get_new_items.call_args.args[0] is snapshot
+
+    coordinator.invalidate_snapshot()
+    assert coordinator._last_snapshot is None
+
+
 async def test_parse_gkeep_data_dict_empty(
     mock_api: MagicMock, mock_hass: MagicMock, mock_config_entry: MockConfigEntry
 ):
     """Test _parse_gkeep_data_dict when empty."""
     test_input: dict = {}
-    expected: dict = {}
+    expected = TodoSnapshot(lists={}, items={})
     coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
     coordinator.data = test_input
 
-    actual = await coordinator._parse_gkeep_data_dict()
+    actual = coordinator._parse_gkeep_data_dict()
     assert actual == expected
 
 
@@ -68,18 +99,17 @@ async def test_parse_gkeep_data_dict_normal(
     """Test _parse_gkeep_data_dict with data."""
     mock_list = MagicMock(id="grocery_list_id", title="Grocery List")
     mock_item = MagicMock(id="milk_item_id", text="Milk", checked=False)
-    mock_list.items = [mock_item]
-    expected = {
-        "grocery_list_id": TodoList(
-            name="Grocery List",
-            items={"milk_item_id": TodoItem(summary="Milk", checked=False)},
-        )
-    }
+    mock_checked_item = MagicMock(id="bread_item_id", text="Bread", checked=True)
+    mock_list.items = [mock_item, mock_checked_item]
+    expected = TodoSnapshot(
+        lists={"grocery_list_id": "Grocery List"},
+        items={("grocery_list_id", "milk_item_id"): "Milk"},
+    )
 
     coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
     coordinator.data = [mock_list]
 
-    actual = await coordinator._parse_gkeep_data_dict()
+    actual = coordinator._parse_gkeep_data_dict()
     assert actual == expected
 
 
@@ -92,21 +122,21 @@ async def test_get_new_items_added(
     # Set up coordinator and mock API
     coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
 
-    list1 = {
-        "grocery_list_id": TodoList(
-            name="Grocery List",
-            items={"milk_item_id": TodoItem(summary="Milk", checked=False)},
-        )
-    }
-    list2 = {
-        "grocery_list_id": TodoList(
-            name="Grocery List",
-            items={
-                "milk_item_id": TodoItem(summary="Milk", checked=False),
-                "bread_item_id": TodoItem(summary="Bread", checked=False),
-            },
-        )
-    }
+    list1 = TodoSnapshot(
+        lists={"grocery_list_id": "Grocery List"},
+        items={("grocery_list_id", "milk_item_id"): "Milk"},
+    )
+    list2 = TodoSnapshot(
+        lists={
+            "grocery_list_id": "Grocery List",
+            "new_list_id": "New List",
+        },
+        items={
+            ("grocery_list_id", "milk_item_id"): "Milk",
+            ("grocery_list_id", "bread_item_id"): "Bread",
+            ("new_list_id", "eggs_item_id"): "Eggs",
+        },
+    )
 
     with patch.object(entity_registry, "async_get") as er:
         instance = er.return_value
@@ -114,7 +144,7 @@ async def test_get_new_items_added(
 
         # Call method under test
         # callback = MagicMock()
-        new_items = await coordinator._get_new_items_added(list1, list2)
+        new_items = coordinator._get_new_items_added(list1, list2)
 
         # Assertions
         expected = [
@@ -133,25 +163,52 @@ async def test_get_new_items_not_added(
     # Set up coordinator and mock API
     coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
 
-    list1 = {
-        "grocery_list_id": TodoList(
-            name="Grocery List",
-            items={"milk_item_id": TodoItem(summary="Milk", checked=False)},
-        )
-    }
+    list1 = TodoSnapshot(
+        lists={"grocery_list_id": "Grocery List"},
+        items={("grocery_list_id", "milk_item_id"): "Milk"},
+    )
 
     # Call method under test
-    new_items = await coordinator._get_new_items_added(list1, list1)
+    new_items = coordinator._get_new_items_added(list1, list1)
 
     # Assertions
     assert new_items == []
 
 
+async def test_notify_new_items_batch_only(
+    mock_api: MagicMock, mock_hass: MagicMock, mock_config_entry: MockConfigEntry
+):
+    """Test that only a single event is fired when service events are disabled."""
+    mock_config_entry.data = {
+        **mock_config_entry.data,
+        "list_item_service_events": False,
+    }
+    coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
+
+    new_items = [
+        TodoItemData(item="Bread", entity_id="list_entity_id"),
+        TodoItemData(item="Milk", entity_id="list_entity_id"),
+    ]
+    # Call method under test
+    await coordinator._notify_new_items(new_items)
+
+    # Assertions
+    mock_hass.bus.async_fire.assert_called_once_with(
+        EVENT_NEW_ITEMS,
+        {
+            "items": [
+                {"item": "Bread", "entity_id": "list_entity_id"},
+                {"item": "Milk", "entity_id": "list_entity_id"},
+            ]
+        },
+        origin=EventOrigin.remote,
+    )
+
+
 async def test_notify_new_items(
     mock_api: MagicMock, mock_hass: MagicMock, mock_config_entry: MockConfigEntry
 ):
-    """Test sending notifications of new items added to a list."""
-    # Set up coordinator and mock API
+    """Test that add_item service call events are fired by default."""
     coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
 
     new_items = [
@@ -173,6 +230,52 @@ async def test_notify_new_items(
     }
 
     # Assertions
-    mock_hass.bus.async_fire.assert_called_once_with(
-        EVENT_CALL_SERVICE, expected, origin=EventOrigin.remote
+    mock_hass.bus.async_fire.assert_has_calls(
+        [
+            call(
+                EVENT_NEW_ITEMS,
+                {"items": [{"item": "Bread", "entity_id": "list_entity_id"}]},
+                origin=EventOrigin.remote,
+            ),
+            call(EVENT_CALL_SERVICE, expected, origin=EventOrigin.remote),
+        ]
     )
+    expected_event_count = 2
+    assert mock_hass.bus.async_fire.call_count == expected_event_count
+
+
+async def test_notify_new_items_empty(
+    mock_api: MagicMock, mock_hass: MagicMock, mock_config_entry: MockConfigEntry
+):
+    """Test that no events are fired when there are no new items."""
+    coordinator = GoogleKeepSyncCoordinator(mock_hass, mock_api, mock_config_entry)
+
+    await coordinator._notify_new_items([])
+
+    mock_hass.bus.async_fire.assert_not_called()
+
+
+async def test_async_schedule_refresh(
+    hass: HomeAssistant, mock_api: MagicMock, mock_config_entry: MockConfigEntry
+):
+    """Test that scheduled refreshes are coalesced into a single refresh."""
+    coordinator = GoogleKeepSyncCoordinator(hass, mock_api, mock_config_entry)
+
+    with patch.object(coordinator, "async_refresh", AsyncMock()) as mock_refresh:
+        assert coordinator.async_schedule_refresh(5) is True
+        assert coordinator.async_schedule_refresh(5) is False
+
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=6))
+        await hass.async_block_till_done()
+        mock_refresh.assert_called_once()
+
+        # A new refresh can be scheduled once the previous one has run
+        assert coordinator.async_schedule_refresh(5) is True
+        await coordinator.async_shutdown()
+
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=12))
+        await hass.async_block_till_done()
+        mock_refresh.assert_called_once()
+
+    mock_api.async_save_state.assert_awaited_once()
+    mock_api.async_shutdown.assert_awaited_once()
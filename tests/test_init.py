@@ -84,20 +84,27 @@ async def test_async_service_request_sync_refresh_called(hass: HomeAssistant, mo
         mock_logger.info.assert_called_with("Requesting manual sync.")
 
 
-async def test_async_service_request_sync_too_soon_warning(
+async def test_async_service_request_sync_too_soon_deferred(
     hass: HomeAssistant, mock_api
 ):
-    """Test that a warning is logged if a sync is requested too soon."""
-    coordinator = AsyncMock()
+    """Test that a sync requested too soon is deferred until the cooldown ends."""
+    coordinator = MagicMock()
     coordinator.last_update_success_time = utcnow()
     coordinator.async_refresh = AsyncMock()
+    coordinator.async_schedule_refresh = MagicMock(side_effect=[True, False])
 
     with patch(
         "custom_components.google_keep_sync.utcnow",
         return_value=coordinator.last_update_success_time + timedelta(seconds=50),
     ), patch("custom_components.google_keep_sync._LOGGER") as mock_logger:
 
-        # Simulate the service call
+        # Simulate two service calls during the cooldown
+        await async_service_request_sync(coordinator, None)
         await async_service_request_sync(coordinator, None)
         assert not coordinator.async_refresh.called
-        mock_logger.warning.assert_called()
+        mock_logger.info.assert_called_once()
+
+        expected_delay = 5
+        assert coordinator.async_schedule_refresh.call_args.args[0] == pytest.approx(
+            expected_delay
+        )
@@ -38,6 +38,7 @@ def mock_coordinator():
     """Return a mocked update coordinator."""
     coordinator = AsyncMock()
     coordinator.data = [{"id": "grocery_list", "title": "Grocery List", "items": []}]
+    coordinator.invalidate_snapshot = MagicMock()
     return coordinator
 
 
@@ -46,6 +47,10 @@ async def test_async_setup_entry(
 ):
     """Test platform setup of todo."""
     mock_config_entry.add_to_hass(hass)
+    mock_coordinator.data = [
+        MagicMock(id="grocery_list", title="Grocery List"),
+        MagicMock(id="todo_list", title="Todo List"),
+    ]
     hass.data[DOMAIN] = {mock_config_entry.entry_id: mock_coordinator}
 
     with patch(
@@ -54,6 +59,14 @@ async def test_async_setup_entry(
         await async_setup_entry(hass, mock_config_entry, mock_add_entities)
         assert mock_add_entities.call_count == 1
 
+        # Entities are created from the coordinator data without a new sync
+        entities = mock_add_entities.call_args.args[0]
+        assert [entity.unique_id for entity in entities] == [
+            f"{DOMAIN}.list.grocery_list",
+            f"{DOMAIN}.list.todo_list",
+        ]
+        mock_coordinator.api.fetch_all_lists.assert_not_called()
+
 
 async def test_create_todo_item(hass: HomeAssistant, mock_api, mock_coordinator):
     """Test creating a todo item."""
@@ -84,15 +97,19 @@ async def test_create_todo_item(hass: HomeAssistant, mock_api, mock_coordinator)
             {"text": item.text} for item in grocery_list.items
         ]
 
-    mock_coordinator.async_refresh = AsyncMock(side_effect=async_refresh_side_effect)
+    mock_coordinator.async_request_refresh = AsyncMock(
+        side_effect=async_refresh_side_effect
+    )
 
     # Create the entity and add a new item
     entity = GoogleKeepTodoListEntity(mock_coordinator, grocery_list, list_prefix)
+    entity.async_write_ha_state = MagicMock()
     await entity.async_create_todo_item(TodoItem(summary="Milk"))
 
     # Ensure the proper methods were called
     mock_api.async_create_todo_item.assert_called_once_with("grocery_list", "Milk")
-    mock_coordinator.async_refresh.assert_called_once()
+    entity.async_write_ha_state.assert_called_once()
+    mock_coordinator.async_request_refresh.assert_called_once()
 
     # Assertions to ensure the item is correctly added
     assert any(item.text == "Milk" for item in grocery_list.items)
@@ -126,10 +143,13 @@ async def test_update_todo_item(hass: HomeAssistant, mock_api, mock_coordinator)
     def async_refresh_side_effect():
         mock_coordinator.data[0]["items"] = grocery_list.items
 
-    mock_coordinator.async_refresh = AsyncMock(side_effect=async_refresh_side_effect)
+    mock_coordinator.async_request_refresh = AsyncMock(
+        side_effect=async_refresh_side_effect
+    )
 
     # Create the entity
     entity = GoogleKeepTodoListEntity(mock_coordinator, grocery_list, list_prefix)
+    entity.async_write_ha_state = MagicMock()
     entity.hass = hass
 
     # update item
@@ -138,7 +158,8 @@ async def test_update_todo_item(hass: HomeAssistant, mock_api, mock_coordinator)
     )
     await entity.async_update_todo_item(updated_item)
     mock_api.async_update_todo_item.assert_called_once()
-    mock_coordinator.async_refresh.assert_called_once()
+    entity.async_write_ha_state.assert_called_once()
+    mock_coordinator.async_request_refresh.assert_called_once()
     updated_list = mock_coordinator.data[0]
 
     assert "grocery_list" == updated_list["id"]
@@ -175,16 +196,20 @@ async def test_delete_todo_items(hass: HomeAssistant, mock_api, mock_coordinator
     def async_refresh_side_effect():
         mock_coordinator.data[0]["items"] = grocery_list.items
 
-    mock_coordinator.async_refresh = AsyncMock(side_effect=async_refresh_side_effect)
+    mock_coordinator.async_request_refresh = AsyncMock(
+        side_effect=async_refresh_side_effect
+    )
 
     # Create the entity
     entity = GoogleKeepTodoListEntity(mock_coordinator, grocery_list, list_prefix)
+    entity.async_write_ha_state = MagicMock()
     entity.hass = hass
 
     # Delete item
     await entity.async_delete_todo_items(["milk_item"])
     mock_api.async_delete_todo_item.assert_called_once_with("grocery_list", "milk_item")
-    mock_coordinator.async_refresh.assert_called_once()
+    entity.async_write_ha_state.assert_called_once()
+    mock_coordinator.async_request_refresh.assert_called_once()
     updated_list = mock_coordinator.data[0]
 
     # Verify "milk_item" is deleted and "eggs_item" remains